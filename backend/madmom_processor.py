@@ -15,7 +15,10 @@ try:
     import numpy as np
     from madmom.features.downbeats import RNNDownBeatProcessor, DBNDownBeatTrackingProcessor
     from madmom.features.beats import BeatTrackingProcessor
+    from madmom.features.onsets import SpectralOnsetProcessor
+    from madmom.audio.filters import LogarithmicFilterbank
     import madmom.audio.signal as signal
+    from waveform_pyramid import write_analysis_files
     MADMOM_AVAILABLE = True
 except ImportError as e:
     MADMOM_AVAILABLE = False
@@ -62,10 +65,16 @@ def process_downbeats(audio_file_path, output_file_path):
         # Initialize processors
         downbeat_processor = RNNDownBeatProcessor()
         downbeat_tracker = DBNDownBeatTrackingProcessor(beats_per_bar=4, fps=100)
+        onset_processor = SpectralOnsetProcessor(onset_method='superflux', fps=100,
+                                                 filterbank=LogarithmicFilterbank, num_bands=24,
+                                                 log=np.log10, mul=1, add=1)
+        
+        # Decode once at the rate the downbeat RNN expects and share the signal
+        audio_signal = signal.Signal(audio_file_path, sample_rate=44100, num_channels=1)
         
         # Process the audio file
         print("Detecting downbeats...")
-        downbeat_activations = downbeat_processor(audio_file_path)
+        downbeat_activations = downbeat_processor(audio_signal)
         downbeats = downbeat_tracker(downbeat_activations)
         
         # Convert to list of timestamps
@@ -73,6 +82,11 @@ def process_downbeats(audio_file_path, output_file_path):
         
         print(f"Found {len(downbeat_times)} downbeats")
         
+        # Reuse the decoded audio for the editor's waveform and onset envelope.
+        # The envelope is computed lazily so an onset failure cannot discard the downbeats.
+        analysis_files = write_analysis_files(output_file_path, audio_signal, audio_signal.sample_rate,
+                                              lambda: onset_processor(audio_signal), 100)
+        
         # Save results to output file
         result = {
             "success": True,
@@ -80,6 +94,7 @@ def process_downbeats(audio_file_path, output_file_path):
             "count": len(downbeat_times),
             "audio_file": audio_file_path
         }
+        result.update(analysis_files)
         
         with open(output_file_path, 'w') as f:
             json.dump(result, f, indent=2)
@@ -11,6 +11,8 @@ import json
 import os
 import numpy as np
 
+from waveform_pyramid import write_analysis_files
+
 def simple_beat_detection(audio_file_path, output_file_path):
     """Simple beat detection using basic audio analysis."""
     
@@ -28,8 +30,13 @@ def simple_beat_detection(audio_file_path, output_file_path):
             # Load audio file
             y, sr = librosa.load(audio_file_path)
             
+            # Compute the onset envelope once; beat tracking and the editor both use it.
+            # Median aggregation matches what beat_track builds internally from y.
+            hop_length = 512
+            onset_envelope = librosa.onset.onset_strength(y=y, sr=sr, hop_length=hop_length, aggregate=np.median)
+            
             # Extract tempo and beat frames
-            tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
+            tempo, beat_frames = librosa.beat.beat_track(onset_envelope=onset_envelope, sr=sr, hop_length=hop_length)
             
             # Convert frames to time
             beat_times = librosa.frames_to_time(beat_frames, sr=sr)
@@ -40,9 +47,13 @@ def simple_beat_detection(audio_file_path, output_file_path):
             print(f"Detected tempo: {float(tempo):.1f} BPM")
             print(f"Found {len(beat_times)} beats, {len(downbeat_times)} downbeats")
             
+            # Reuse the decoded audio for the editor's waveform and onset envelope
+            analysis_files = write_analysis_files(output_file_path, y, sr, onset_envelope, sr / hop_length)
+            
         else:
             # Fallback: create evenly spaced beats based on common tempos
             print("Using fallback beat detection...")
+            analysis_files = {}
             
             # Get audio duration (basic approach)
             import wave
@@ -77,6 +88,7 @@ def simple_beat_detection(audio_file_path, output_file_path):
             "audio_file": audio_file_path,
             "method": "librosa" if LIBROSA_AVAILABLE else "fallback"
         }
+        result.update(analysis_files)
         
         with open(output_file_path, 'w') as f:
             json.dump(result, f, indent=2)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Waveform Pyramid Test Script
+============================
+Checks the binary layout of waveform_peaks.bin and onset_envelope.bin written by
+waveform_pyramid.py, which the editor parses to draw the waveform.
+
+Usage:
+    python3 test_waveform_pyramid.py
+"""
+
+import os
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+from waveform_pyramid import (
+    build_peak_pyramid,
+    write_onset_envelope,
+    write_waveform_peaks,
+)
+
+
+def read_waveform_file(path):
+    """Parse a waveform_peaks.bin file into its header, level table and int8 peaks"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, version, num_levels, sample_rate, total_samples = struct.unpack_from("<4sHHII", data, 0)
+    offset = 16
+    table = []
+    for _ in range(num_levels):
+        table.append(struct.unpack_from("<II", data, offset))
+        offset += 8
+
+    peaks = []
+    for _, num_peaks in table:
+        peaks.append(np.frombuffer(data, dtype="<i1", count=num_peaks * 2, offset=offset))
+        offset += num_peaks * 2
+
+    assert offset == len(data), "Trailing bytes after last level"
+    return (magic, version, num_levels, sample_rate, total_samples), table, peaks
+
+
+def write_and_read(samples, sample_rate=22050):
+    """Write samples to a temporary waveform file and parse it back"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "waveform_peaks.bin")
+        levels = write_waveform_peaks(samples, sample_rate, path)
+        return levels, read_waveform_file(path)
+
+
+def test_header_layout():
+    samples = np.linspace(-0.5, 0.5, 1000, dtype=np.float32)
+    levels, (header, table, _) = write_and_read(samples, sample_rate=44100)
+
+    assert header == (b"WVPK", 1, 3, 44100, 1000)
+    assert table == [(256, 4), (512, 2), (1024, 1)]
+    assert levels == [{"samples_per_peak": spp, "peaks": n} for spp, n in table]
+
+
+def test_uneven_lengths():
+    # 257 samples spill one sample into a second bucket
+    levels = build_peak_pyramid(np.ones(257, dtype=np.float32))
+    assert [(spp, len(mins)) for spp, mins, _ in levels] == [(256, 2), (512, 1)]
+
+    # 1000 samples -> 4 buckets, the last one padded with the final sample
+    samples = np.zeros(1000, dtype=np.float32)
+    samples[-1] = 0.25
+    levels = build_peak_pyramid(samples)
+    assert [(spp, len(mins)) for spp, mins, _ in levels] == [(256, 4), (512, 2), (1024, 1)]
+    _, mins, maxs = levels[0]
+    assert mins[-1] == 0.0 and maxs[-1] == 0.25
+
+    # Coarser levels keep the extremes of the level below
+    samples = np.zeros(1000, dtype=np.float32)
+    samples[10], samples[900] = -0.75, 0.5
+    _, mins, maxs = build_peak_pyramid(samples)[-1]
+    assert mins.tolist() == [-0.75] and maxs.tolist() == [0.5]
+
+
+def test_int16_scaling():
+    samples = np.zeros(512, dtype=np.int16)
+    samples[:3] = [32767, -32768, 16384]
+    samples[300] = -16384
+    _, (header, _, peaks) = write_and_read(samples)
+
+    assert header[4] == 512
+    # First level: (min, max) per 256-sample bucket
+    assert peaks[0].tolist() == [-127, 127, -64, 0]
+    assert peaks[1].tolist() == [-127, 127]
+
+
+def test_empty_input():
+    levels, (header, table, peaks) = write_and_read(np.zeros(0, dtype=np.float32))
+    assert header == (b"WVPK", 1, 1, 22050, 0)
+    assert table == [(256, 1)]
+    assert peaks[0].tolist() == [0, 0]
+    assert levels == [{"samples_per_peak": 256, "peaks": 1}]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "onset_envelope.bin")
+        assert write_onset_envelope([], 100, path) == 0
+        with open(path, "rb") as f:
+            data = f.read()
+        assert struct.unpack("<4sHHffI", data) == (b"ONST", 1, 0, 100.0, 0.0, 0)
+
+
+def test_onset_envelope_layout():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "onset_envelope.bin")
+        assert write_onset_envelope([0.0, 1.0, 2.0, np.nan], 43.0, path) == 4
+        with open(path, "rb") as f:
+            data = f.read()
+
+    assert struct.unpack_from("<4sHHffI", data, 0) == (b"ONST", 1, 0, 43.0, 2.0, 4)
+    assert list(data[20:]) == [0, 128, 255, 0]
+
+
+def main():
+    """Run all tests and report results"""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Waveform Pyramid Writer
+=======================
+Writes a multi-resolution min/max waveform peak pyramid and the onset-strength
+envelope as compact little-endian binary files next to downbeats.json, so the
+editor can draw and zoom the waveform without fetching and decoding the song.
+
+waveform_peaks.bin
+    header   b"WVPK", uint16 version, uint16 level count,
+             uint32 sample rate, uint32 total samples
+    levels   per level: uint32 samples per peak, uint32 peak count
+    data     per level, in order: int8 (min, max) pairs, scaled by 127
+
+onset_envelope.bin
+    header   b"ONST", uint16 version, uint16 reserved,
+             float32 frames per second, float32 peak value, uint32 frame count
+    data     uint8 envelope values, normalized so 255 == peak value
+"""
+
+import os
+import struct
+
+import numpy as np
+
+WAVEFORM_FILE = "waveform_peaks.bin"
+ONSET_ENVELOPE_FILE = "onset_envelope.bin"
+
+FORMAT_VERSION = 1
+BASE_SAMPLES_PER_PEAK = 256
+NUM_LEVELS = 8
+
+
+def build_peak_pyramid(samples, base_samples_per_peak=BASE_SAMPLES_PER_PEAK, num_levels=NUM_LEVELS):
+    """Return a list of (samples_per_peak, mins, maxs) for mono samples, finest first."""
+
+    samples = np.asarray(samples, dtype=np.float32).ravel()
+
+    # Pad with the last sample so every bucket is full without inventing silence
+    num_peaks = max(1, -(-len(samples) // base_samples_per_peak))
+    padded = np.empty(num_peaks * base_samples_per_peak, dtype=np.float32)
+    padded[:len(samples)] = samples
+    padded[len(samples):] = samples[-1] if len(samples) else 0.0
+
+    buckets = padded.reshape(num_peaks, base_samples_per_peak)
+    mins = buckets.min(axis=1)
+    maxs = buckets.max(axis=1)
+
+    levels = [(base_samples_per_peak, mins, maxs)]
+    samples_per_peak = base_samples_per_peak
+
+    # Each coarser level halves the previous one, so the full samples are read only once
+    while len(levels) < num_levels and len(mins) > 1:
+        if len(mins) % 2:
+            mins = np.append(mins, mins[-1])
+            maxs = np.append(maxs, maxs[-1])
+        mins = np.minimum(mins[0::2], mins[1::2])
+        maxs = np.maximum(maxs[0::2], maxs[1::2])
+        samples_per_peak *= 2
+        levels.append((samples_per_peak, mins, maxs))
+
+    return levels
+
+
+def write_waveform_peaks(samples, sample_rate, output_path):
+    """Write the waveform peak pyramid for decoded mono samples to output_path."""
+
+    samples = np.asarray(samples).ravel()
+    if np.issubdtype(samples.dtype, np.integer):
+        # madmom keeps decoded audio as integer PCM
+        samples = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max)
+
+    levels = build_peak_pyramid(samples)
+
+    with open(output_path, "wb") as f:
+        f.write(struct.pack("<4sHHII", b"WVPK", FORMAT_VERSION, len(levels), int(sample_rate), len(samples)))
+        for samples_per_peak, mins, _ in levels:
+            f.write(struct.pack("<II", samples_per_peak, len(mins)))
+        for _, mins, maxs in levels:
+            peaks = np.empty(len(mins) * 2, dtype=np.float32)
+            peaks[0::2] = mins
+            peaks[1::2] = maxs
+            f.write(np.clip(np.round(peaks * 127), -128, 127).astype("<i1").tobytes())
+
+    return [{"samples_per_peak": spp, "peaks": len(mins)} for spp, mins, _ in levels]
+
+
+def write_onset_envelope(envelope, fps, output_path):
+    """Write an onset-strength envelope sampled at fps frames per second to output_path."""
+
+    envelope = np.nan_to_num(np.asarray(envelope, dtype=np.float32).ravel())
+    peak = float(envelope.max()) if len(envelope) else 0.0
+    scaled = envelope / peak if peak > 0 else envelope
+
+    with open(output_path, "wb") as f:
+        f.write(struct.pack("<4sHHffI", b"ONST", FORMAT_VERSION, 0, float(fps), peak, len(envelope)))
+        f.write(np.clip(np.round(scaled * 255), 0, 255).astype(np.uint8).tobytes())
+
+    return len(envelope)
+
+
+def write_analysis_files(output_file_path, samples, sample_rate, onset_envelope, onset_fps):
+    """Write both files next to output_file_path and return fields for the downbeats JSON.
+
+    onset_envelope may be an array or a callable returning one, so that computing it
+    is covered too. Failures are reported but never raised, since downbeats are still
+    usable without these files.
+    """
+
+    output_dir = os.path.dirname(os.path.abspath(output_file_path))
+    fields = {}
+
+    try:
+        levels = write_waveform_peaks(samples, sample_rate, os.path.join(output_dir, WAVEFORM_FILE))
+        fields["waveform_file"] = WAVEFORM_FILE
+        fields["waveform_levels"] = levels
+        print(f"Waveform pyramid saved: {len(levels)} levels")
+    except Exception as e:
+        print(f"⚠️  Could not write waveform pyramid: {e}")
+
+    try:
+        if callable(onset_envelope):
+            onset_envelope = onset_envelope()
+        frames = write_onset_envelope(onset_envelope, onset_fps, os.path.join(output_dir, ONSET_ENVELOPE_FILE))
+        fields["onset_envelope_file"] = ONSET_ENVELOPE_FILE
+        fields["onset_envelope_fps"] = float(onset_fps)
+        print(f"Onset envelope saved: {frames} frames at {float(onset_fps):.1f} fps")
+    except Exception as e:
+        print(f"⚠️  Could not write onset envelope: {e}")
+
+    return fields